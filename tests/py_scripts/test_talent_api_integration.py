@@ -10,6 +10,7 @@ Usage:
     python tests/test_talent_api_integration.py --worker-url http://localhost:8787
     python tests/test_talent_api_integration.py --direct-only
     python tests/test_talent_api_integration.py --worker-only
+    python tests/test_talent_api_integration.py --worker-only --summary-only
 """
 
 import json
@@ -17,6 +18,7 @@ import os
 import sys
 import time
 import argparse
+import logging
 import requests
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -25,7 +27,12 @@ from datetime import datetime
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Default query for the measured talent search; the cache warm-up primes the same one
+DEFAULT_TALENT_QUERY = "software engineer"
+
+@dataclass(slots=True)
 class TestResult:
     """Test result container"""
     test_name: str
@@ -37,24 +44,38 @@ class TestResult:
 class TalentAPITester:
     """Comprehensive Talent API testing class"""
     
-    def __init__(self, worker_url: str = "http://localhost:8787", api_key: str = None):
+    def __init__(self, worker_url: str = "http://localhost:8787", api_key: str = None, summary_only: bool = False):
         self.worker_url = worker_url.rstrip('/')
         self.api_key = api_key or os.getenv('WORKER_API_KEY', 'test-key')
+        self.summary_only = summary_only
         self.results: List[TestResult] = []
+        self._pass = 0
+        self._fail = 0
+        self._total_duration = 0.0
         
         # Load service account credentials
         self.service_account_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), 
             'scripts', 'setup', 'talent-api-sa-key.json'
         )
+        self._pkey = None
         self.service_account = self._load_service_account()
         
     def _load_service_account(self) -> Optional[Dict[str, Any]]:
         """Load service account credentials from JSON file"""
         try:
             if os.path.exists(self.service_account_path):
+                from cryptography.hazmat.primitives import serialization
+                
                 with open(self.service_account_path, 'r') as f:
-                    return json.load(f)
+                    service_account = json.load(f)
+                
+                # Parse the PEM once so every JWT signing reuses the key object
+                self._pkey = serialization.load_pem_private_key(
+                    service_account['private_key'].encode(),
+                    password=None
+                )
+                return service_account
             else:
                 print(f"⚠️  Service account file not found: {self.service_account_path}")
                 print("   Direct API tests will be skipped")
@@ -71,6 +92,21 @@ class TalentAPITester:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {e}")
     
+    def _summarize_talent_response(self, response: requests.Response) -> Dict[str, Any]:
+        """Stream a talent response and keep only the job count and provider"""
+        import ijson
+        
+        count = 0
+        provider = None
+        response.raw.decode_content = True
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix == 'results.item' and event == 'start_map':
+                count += 1
+            elif prefix == 'provider' and event == 'string':
+                provider = value
+        
+        return {'results_count': count, 'provider': provider}
+    
     def _test_worker_health(self) -> TestResult:
         """Test if the Worker is running and healthy"""
         start_time = time.time()
@@ -103,7 +139,17 @@ class TalentAPITester:
                 error=str(e)
             )
     
-    def _test_worker_talent_search(self, query: str = "software engineer") -> TestResult:
+    @staticmethod
+    def _talent_search_params(query: str) -> Dict[str, Any]:
+        """Query parameters for a Worker talent search, shared by the measured test and its warm-up"""
+        return {
+            'q': query,
+            'location': 'San Francisco, CA',
+            'n': 10,
+            'provider': 'serper'
+        }
+    
+    def _test_worker_talent_search(self, query: str = DEFAULT_TALENT_QUERY) -> TestResult:
         """Test job search through Worker API (Serper API)"""
         start_time = time.time()
         try:
@@ -112,37 +158,37 @@ class TalentAPITester:
                 'Content-Type': 'application/json'
             }
             
-            params = {
-                'q': query,
-                'location': 'San Francisco, CA',
-                'n': 10,
-                'provider': 'serper'
-            }
+            params = self._talent_search_params(query)
             
             response = self._make_request(
                 'GET', 
                 f"{self.worker_url}/api/talent", 
                 headers=headers,
-                params=params
+                params=params,
+                stream=self.summary_only
             )
             
-            duration = time.time() - start_time
-            
-            if response.status_code == 200:
-                data = response.json()
-                return TestResult(
-                    test_name="Worker Talent Search",
-                    success=True,
-                    duration=duration,
-                    data=data
-                )
-            else:
-                return TestResult(
-                    test_name="Worker Talent Search",
-                    success=False,
-                    duration=duration,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
+            # Closing releases a streamed connection; timings include reading the body in both modes
+            with response:
+                if response.status_code == 200:
+                    if self.summary_only:
+                        data = self._summarize_talent_response(response)
+                    else:
+                        data = response.json()
+                    return TestResult(
+                        test_name="Worker Talent Search",
+                        success=True,
+                        duration=time.time() - start_time,
+                        data=data
+                    )
+                else:
+                    error = f"HTTP {response.status_code}: {response.text}"
+                    return TestResult(
+                        test_name="Worker Talent Search",
+                        success=False,
+                        duration=time.time() - start_time,
+                        error=error
+                    )
         except Exception as e:
             duration = time.time() - start_time
             return TestResult(
@@ -171,26 +217,31 @@ class TalentAPITester:
                 'GET', 
                 f"{self.worker_url}/api/talent", 
                 headers=headers,
-                params=params
+                params=params,
+                stream=self.summary_only
             )
             
-            duration = time.time() - start_time
-            
-            if response.status_code == 200:
-                data = response.json()
-                return TestResult(
-                    test_name="Worker Talent Suggestions",
-                    success=True,
-                    duration=duration,
-                    data=data
-                )
-            else:
-                return TestResult(
-                    test_name="Worker Talent Suggestions",
-                    success=False,
-                    duration=duration,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
+            # Closing releases a streamed connection; timings include reading the body in both modes
+            with response:
+                if response.status_code == 200:
+                    if self.summary_only:
+                        data = self._summarize_talent_response(response)
+                    else:
+                        data = response.json()
+                    return TestResult(
+                        test_name="Worker Talent Suggestions",
+                        success=True,
+                        duration=time.time() - start_time,
+                        data=data
+                    )
+                else:
+                    error = f"HTTP {response.status_code}: {response.text}"
+                    return TestResult(
+                        test_name="Worker Talent Suggestions",
+                        success=False,
+                        duration=time.time() - start_time,
+                        error=error
+                    )
         except Exception as e:
             duration = time.time() - start_time
             return TestResult(
@@ -200,6 +251,25 @@ class TalentAPITester:
                 error=str(e)
             )
     
+    def _prime(self, query: str = DEFAULT_TALENT_QUERY) -> None:
+        """Issue a discarded talent search so measured tests hit a warm Worker cache"""
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'X-Prime': '1'
+        }
+        
+        try:
+            response = self._make_request(
+                'GET', 
+                f"{self.worker_url}/api/talent", 
+                headers=headers,
+                params=self._talent_search_params(query)
+            )
+            logger.debug("Cache priming request returned HTTP %s", response.status_code)
+        except Exception as e:
+            logger.debug("Cache priming failed: %s", e)
+    
     def _get_google_access_token(self) -> str:
         """Get Google access token using service account credentials"""
         if not self.service_account:
@@ -218,9 +288,8 @@ class TalentAPITester:
             'exp': now + 3600
         }
         
-        # Create JWT token
-        private_key = self.service_account['private_key']
-        token = jwt.encode(payload, private_key, algorithm='RS256')
+        # Create JWT token with the preloaded cryptography key object
+        token = jwt.encode(payload, self._pkey, algorithm='RS256')
         
         # Exchange JWT for access token
         response = self._make_request('POST', self.service_account['token_uri'], data={
@@ -322,28 +391,31 @@ class TalentAPITester:
                 error=str(e)
             )
     
-    def run_worker_tests(self) -> None:
+    def run_worker_tests(self, warmup: bool = False) -> None:
         """Run all Worker API tests"""
         print("🔧 Testing Cloudflare Worker API...")
         print("=" * 50)
         
         # Health check
         result = self._test_worker_health()
-        self.results.append(result)
+        self._record(result)
         self._print_result(result)
         
         if not result.success:
             print("❌ Worker is not responding. Skipping Worker API tests.")
             return
         
+        if warmup:
+            self._prime()
+        
         # Talent search
         result = self._test_worker_talent_search()
-        self.results.append(result)
+        self._record(result)
         self._print_result(result)
         
         # Talent suggestions
         result = self._test_worker_talent_suggestions()
-        self.results.append(result)
+        self._record(result)
         self._print_result(result)
     
     def run_direct_tests(self) -> None:
@@ -357,14 +429,21 @@ class TalentAPITester:
         
         # Direct search
         result = self._test_direct_google_search()
-        self.results.append(result)
+        self._record(result)
         self._print_result(result)
         
         # Direct suggestions
         result = self._test_direct_google_suggestions()
-        self.results.append(result)
+        self._record(result)
         self._print_result(result)
     
+    def _record(self, result: TestResult) -> None:
+        """Store a test result and update the rolling summary counters"""
+        self._pass += result.success
+        self._fail += not result.success
+        self._total_duration += result.duration
+        self.results.append(result)
+    
     def _print_result(self, result: TestResult) -> None:
         """Print test result with formatting"""
         status = "✅" if result.success else "❌"
@@ -377,7 +456,10 @@ class TalentAPITester:
         
         if result.data and result.success:
             # Print relevant data
-            if 'results' in result.data:
+            if 'results_count' in result.data:
+                provider = result.data.get('provider') or 'unknown'
+                print(f"   Found {result.data['results_count']} jobs via {provider}")
+            elif 'results' in result.data:
                 jobs_count = len(result.data.get('results', []))
                 provider = result.data.get('provider', 'unknown')
                 print(f"   Found {jobs_count} jobs via {provider}")
@@ -390,14 +472,14 @@ class TalentAPITester:
             elif 'status' in result.data:
                 print(f"   Status: {result.data['status']}")
     
-    def print_summary(self) -> None:
-        """Print test summary"""
+    def print_summary(self) -> int:
+        """Print test summary and return the number of failed tests"""
         print("\n📊 Test Summary")
         print("=" * 50)
         
         total_tests = len(self.results)
-        successful_tests = sum(1 for r in self.results if r.success)
-        failed_tests = total_tests - successful_tests
+        successful_tests = self._pass
+        failed_tests = self._fail
         
         print(f"Total Tests: {total_tests}")
         print(f"✅ Passed: {successful_tests}")
@@ -410,7 +492,9 @@ class TalentAPITester:
                 if not result.success:
                     print(f"   - {result.test_name}: {result.error}")
         
-        print(f"\n⏱️  Total Duration: {sum(r.duration for r in self.results):.2f}s")
+        print(f"\n⏱️  Total Duration: {self._total_duration:.2f}s")
+        
+        return failed_tests
     
     def save_results(self, filename: str = None) -> None:
         """Save test results to JSON file"""
@@ -452,6 +536,10 @@ def main():
                        help='Only test direct Google API')
     parser.add_argument('--save-results', action='store_true',
                        help='Save results to JSON file')
+    parser.add_argument('--summary-only', action='store_true',
+                       help='Stream Worker talent responses and keep only job counts')
+    parser.add_argument('--warmup', action='store_true',
+                       help='Prime Worker caches with a discarded request before measuring')
     
     args = parser.parse_args()
     
@@ -463,24 +551,24 @@ def main():
     print()
     
     # Create tester
-    tester = TalentAPITester(args.worker_url, args.api_key)
+    tester = TalentAPITester(args.worker_url, args.api_key, summary_only=args.summary_only)
     
     # Run tests based on arguments
     if not args.direct_only:
-        tester.run_worker_tests()
+        tester.run_worker_tests(warmup=args.warmup)
     
     if not args.worker_only:
         tester.run_direct_tests()
     
     # Print summary
-    tester.print_summary()
+    failed = tester.print_summary()
     
     # Save results if requested
     if args.save_results:
         tester.save_results()
     
     # Exit with error code if any tests failed
-    if any(not r.success for r in tester.results):
+    if failed:
         sys.exit(1)
 
 if __name__ == '__main__':
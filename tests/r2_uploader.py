@@ -5,27 +5,100 @@ Uploads files from local assets directory to Cloudflare R2 bucket through worker
 """
 
 import os
+import gzip
+import mimetypes
+import concurrent.futures
 import requests
-from pathlib import Path
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parallel uploads per directory; the session pool is sized to match
+MAX_UPLOAD_WORKERS = 16
+
+# Files at or above this size are streamed from disk rather than read into memory
+STREAM_UPLOAD_THRESHOLD = 1024 * 1024
+
+# Text bodies in this size range are gzip-compressed in memory before upload, but only
+# when enabled (R2_UPLOAD_GZIP=1): the worker's upload route must decode Content-Encoding
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_MAX_BYTES = 50 * 1024 * 1024
+_COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/xml')
+
+# Smaller files are packed into multipart batches of at most this many files / bytes, but only
+# when enabled (R2_UPLOAD_BATCH=1): the worker must expose /api/r2/upload-batch
+BATCH_MAX_FILES = 32
+BATCH_MAX_BYTES = 1024 * 1024
+
+# Extension -> content type, built once; explicit entries override the system mimetypes table
+_CONTENT_TYPES = {
+    **mimetypes.types_map,
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.pdf': 'application/pdf',
+    '.html': 'text/html',
+    '.md': 'text/markdown',
+    '.json': 'application/json',
+    '.txt': 'text/plain',
+    '.csv': 'text/csv',
+    '.xml': 'application/xml',
+}
+
+def _iter_files(root: str) -> Iterator[Tuple[str, int]]:
+    """Yield (path, size) for files under root using scandir's cached entry data"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat().st_size
+
 class R2Uploader:
     """Handles uploading files to Cloudflare R2 bucket via worker endpoint"""
     
-    def __init__(self, worker_url: str, worker_api_key: str):
+    def __init__(self, worker_url: str, worker_api_key: str, compress: Optional[bool] = None, batch: Optional[bool] = None):
         self.worker_url = worker_url.rstrip('/')
         self.worker_api_key = worker_api_key
+        if compress is None:
+            compress = os.getenv('R2_UPLOAD_GZIP', '').lower() in ('1', 'true', 'yes')
+        self.compress = compress
+        if batch is None:
+            batch = os.getenv('R2_UPLOAD_BATCH', '').lower() in ('1', 'true', 'yes')
         self.upload_endpoint = f"{self.worker_url}/api/r2/upload"
+        self.batch_endpoint = f"{self.worker_url}/api/r2/upload-batch"
+        # Cleared the first time the worker rejects the batch route
+        self._batch_supported = batch
         
         # Set up session with authentication
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {worker_api_key}',
-            'User-Agent': 'BrowserRenderingTest/1.0'
+            'User-Agent': 'BrowserRenderingTest/1.0',
+            'Connection': 'keep-alive'
         })
+        
+        # Pool connections so every upload after the first reuses the TLS session
+        retry = Retry(
+            total=3, backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"]
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=MAX_UPLOAD_WORKERS, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session"""
+        self.session.close()
     
     def upload_file(self, local_file_path: str, r2_key: str) -> bool:
         """Upload a file to R2 bucket via worker endpoint"""
@@ -33,96 +106,151 @@ class R2Uploader:
             # Determine content type based on file extension
             content_type = self._get_content_type(local_file_path)
             
-            # Read file data
-            with open(local_file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Upload via worker endpoint
-            response = self.session.post(
-                self.upload_endpoint,
-                params={'key': r2_key},
-                data=file_data,
-                headers={'Content-Type': content_type},
-                timeout=30
+            size = os.path.getsize(local_file_path)
+            headers = {'Content-Type': content_type}
+            compress = (
+                self.compress
+                and content_type.startswith(_COMPRESSIBLE_TYPES)
+                and COMPRESS_MIN_BYTES < size <= COMPRESS_MAX_BYTES
             )
             
+            with open(local_file_path, 'rb') as f:
+                if compress:
+                    # Text compresses well, so trade a little CPU for far fewer bytes on the wire
+                    body = gzip.compress(f.read(), compresslevel=6)
+                    headers['Content-Encoding'] = 'gzip'
+                    size = len(body)
+                else:
+                    # Small payloads go out in a single send; large ones stream in chunks
+                    body = f.read() if size < STREAM_UPLOAD_THRESHOLD else f
+                headers['Content-Length'] = str(size)
+                
+                # Upload via worker endpoint
+                response = self.session.post(
+                    self.upload_endpoint,
+                    params={'key': r2_key},
+                    data=body,
+                    headers=headers,
+                    timeout=(10, 120)
+                )
+            
             if response.status_code == 201:
                 result = response.json()
-                logger.info(f"✅ Uploaded {local_file_path} to R2: {r2_key} (size: {result.get('size', 'unknown')} bytes)")
+                logger.info("✅ Uploaded %s to R2: %s (size: %s bytes)", local_file_path, r2_key, result.get('size', 'unknown'))
                 return True
             else:
-                logger.error(f"❌ Failed to upload {local_file_path}: {response.status_code} - {response.text}")
+                logger.error("❌ Failed to upload %s: %s - %s", local_file_path, response.status_code, response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Failed to upload {local_file_path}: {e}")
+            logger.error("❌ Failed to upload %s: %s", local_file_path, e)
             return False
     
-    def _get_content_type(self, file_path: str) -> str:
-        """Determine content type based on file extension"""
-        path = Path(file_path)
-        extension = path.suffix.lower()
+    def upload_batch(self, entries: List[Tuple[str, str]]) -> int:
+        """Upload several small files in one multipart request; returns the number uploaded
+        
+        Each (local_file_path, r2_key) entry becomes a multipart field named by its
+        R2 key. Falls back to per-file uploads whenever the batch request does not succeed.
+        """
+        if not self._batch_supported:
+            return self._upload_each(entries)
         
-        content_types = {
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-            '.pdf': 'application/pdf',
-            '.html': 'text/html',
-            '.md': 'text/markdown',
-            '.json': 'application/json',
-            '.txt': 'text/plain',
-            '.csv': 'text/csv',
-            '.xml': 'application/xml',
-        }
+        handles = []
+        try:
+            files = []
+            for local_file_path, r2_key in entries:
+                f = open(local_file_path, 'rb')
+                handles.append(f)
+                files.append((r2_key, (os.path.basename(local_file_path), f, self._get_content_type(local_file_path))))
+            
+            response = self.session.post(self.batch_endpoint, files=files, timeout=(10, 120))
+        except Exception as e:
+            logger.warning("⚠️ Batch upload of %s files failed, falling back to per-file uploads: %s", len(entries), e)
+            return self._upload_each(entries)
+        finally:
+            for f in handles:
+                f.close()
         
-        return content_types.get(extension, 'application/octet-stream')
+        if response.status_code == 201:
+            # A 201 without a JSON count still means every file in the batch was accepted
+            try:
+                uploaded = response.json().get('uploaded', len(entries))
+            except ValueError:
+                uploaded = len(entries)
+            logger.info("✅ Uploaded batch of %s files to R2", uploaded)
+            return uploaded
+        elif response.status_code in (404, 405):
+            logger.warning("⚠️ Worker has no batch upload route, falling back to per-file uploads")
+            self._batch_supported = False
+            return self._upload_each(entries)
+        else:
+            logger.warning("⚠️ Batch upload of %s files failed, falling back to per-file uploads: %s - %s", len(entries), response.status_code, response.text)
+            return self._upload_each(entries)
+    
+    def _upload_each(self, entries: List[Tuple[str, str]]) -> int:
+        """Upload entries one request at a time"""
+        return sum(1 for local_file_path, r2_key in entries if self.upload_file(local_file_path, r2_key))
     
-    def upload_directory(self, local_dir: str, r2_prefix: str = "tests/assets/browser-render") -> int:
-        """Upload all files from a directory to R2 bucket"""
-        local_path = Path(local_dir)
-        if not local_path.exists():
-            logger.error(f"❌ Local directory does not exist: {local_dir}")
+    @staticmethod
+    def _get_content_type(file_path: str) -> str:
+        """Determine content type based on file extension"""
+        extension = os.path.splitext(file_path)[1].lower()
+        return _CONTENT_TYPES.get(extension, 'application/octet-stream')
+    
+    def upload_directory(self, local_dir: str, r2_prefix: str = "tests/assets/browser-render",
+                         max_workers: int = MAX_UPLOAD_WORKERS) -> int:
+        """Upload all files from a directory to R2 bucket using a thread pool"""
+        if not os.path.isdir(local_dir):
+            logger.error("❌ Local directory does not exist: %s", local_dir)
             return 0
         
-        uploaded_count = 0
+        # Large files stream individually; with batching enabled, small ones are grouped into multipart batches
+        single_files = []
+        batches = []
+        batch, batch_bytes = [], 0
+        prefix_with_slash = r2_prefix.rstrip('/') + '/'
+        for path, size in _iter_files(local_dir):
+            r2_key = ''.join((prefix_with_slash, os.path.relpath(path, local_dir).replace(os.sep, '/')))
+            if not self._batch_supported or size >= STREAM_UPLOAD_THRESHOLD:
+                single_files.append((path, r2_key))
+                continue
+            if batch and (len(batch) >= BATCH_MAX_FILES or batch_bytes + size > BATCH_MAX_BYTES):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append((path, r2_key))
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
         
-        for file_path in local_path.rglob('*'):
-            if file_path.is_file():
-                # Create R2 key with prefix
-                relative_path = file_path.relative_to(local_path)
-                r2_key = f"{r2_prefix}/{relative_path}"
-                
-                if self.upload_file(str(file_path), r2_key):
-                    uploaded_count += 1
+        # Uploads are network-bound, so threads overlap the per-request round trips
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.upload_file, path, r2_key) for path, r2_key in single_files]
+            futures += [executor.submit(self.upload_batch, entries) for entries in batches]
+            uploaded_count = sum(int(f.result()) for f in concurrent.futures.as_completed(futures))
         
-        logger.info(f"📦 Uploaded {uploaded_count} files to R2 bucket via worker")
+        logger.info("📦 Uploaded %s files to R2 bucket via worker", uploaded_count)
         return uploaded_count
     
     def test_connection(self) -> bool:
         """Test connection to worker endpoint"""
         try:
-            # Try to upload a small test file
-            test_data = b"test"
-            response = self.session.post(
-                self.upload_endpoint,
-                params={'key': 'test/connection-test.txt'},
-                data=test_data,
-                headers={'Content-Type': 'text/plain'},
-                timeout=10
-            )
+            # A single HEAD of the upload route, so the probe never writes to R2. A 405 proves the
+            # route exists and the API key was accepted; POST-only routers answer HEAD with 404,
+            # which only shows the worker is reachable
+            response = self.session.head(self.upload_endpoint, timeout=5)
             
-            if response.status_code == 201:
+            if response.ok or response.status_code == 405:
                 logger.info("✅ Worker endpoint connection test successful")
                 return True
+            elif response.status_code == 404:
+                logger.info("✅ Worker endpoint reachable (API key not verified until the first upload)")
+                return True
             else:
-                logger.error(f"❌ Worker endpoint connection test failed: {response.status_code} - {response.text}")
+                logger.error("❌ Worker endpoint connection test failed: %s - %s", response.status_code, response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Worker endpoint connection test failed: {e}")
+            logger.error("❌ Worker endpoint connection test failed: %s", e)
             return False
 
 def load_worker_config() -> dict:
@@ -141,7 +269,7 @@ def main():
     missing_keys = [key for key in required_keys if not config[key]]
     
     if missing_keys:
-        logger.error(f"❌ Missing worker configuration: {', '.join(missing_keys)}")
+        logger.error("❌ Missing worker configuration: %s", ', '.join(missing_keys))
         logger.error("Please set the following environment variables:")
         logger.error("- WORKER_URL (e.g., https://your-worker.your-subdomain.workers.dev)")
         logger.error("- WORKER_API_KEY (API key for worker authentication)")
@@ -153,19 +281,22 @@ def main():
         worker_api_key=config['worker_api_key']
     )
     
-    # Test connection first
-    if not uploader.test_connection():
-        logger.error("❌ Failed to connect to worker endpoint. Check your configuration.")
-        return
-    
-    # Upload assets
-    local_assets_dir = "scripts/assets/browser-render"
-    uploaded_count = uploader.upload_directory(local_assets_dir)
-    
-    if uploaded_count > 0:
-        logger.info(f"🎉 Successfully uploaded {uploaded_count} files to R2 bucket via worker!")
-    else:
-        logger.warning("⚠️ No files were uploaded. Check the local assets directory.")
+    try:
+        # Test connection first
+        if not uploader.test_connection():
+            logger.error("❌ Failed to connect to worker endpoint. Check your configuration.")
+            return
+        
+        # Upload assets
+        local_assets_dir = "scripts/assets/browser-render"
+        uploaded_count = uploader.upload_directory(local_assets_dir)
+        
+        if uploaded_count > 0:
+            logger.info("🎉 Successfully uploaded %s files to R2 bucket via worker!", uploaded_count)
+        else:
+            logger.warning("⚠️ No files were uploaded. Check the local assets directory.")
+    finally:
+        uploader.close()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -6,21 +6,43 @@ Tests both local file saving and R2 bucket upload capabilities
 """
 
 import os
+import re
+import functools
 import json
-import base64
+import random
+import time
 import asyncio
 import aiohttp
 import argparse
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Union
 import logging
 
+# Paths resolved once at import; .dev.vars lives in the project root (the parent of tests/)
+_THIS_FILE = Path(__file__).resolve()
+_PROJECT_ROOT = _THIS_FILE.parents[1]
+_DEV_VARS_FILE = _PROJECT_ROOT / ".dev.vars"
+_LOG_FILE = _THIS_FILE.parent / "browser_rendering_test.log"
+
+class _NoEmojiFormatter(logging.Formatter):
+    """Formatter that drops emoji decoration from log lines, keeping all other text intact"""
+    
+    # Pictographs, dingbats/symbols, variation selector 16 and zero-width joiner
+    _emoji = re.compile('[\U0001F300-\U0001FAFF\u2600-\u27BF\uFE0F\u200D]+')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        # Plain-ASCII records (most data lines) skip the substitution entirely
+        return text if text.isascii() else self._emoji.sub('', text)
+
 # Configure logging to both console and file
 def setup_logging():
     """Setup logging to both console and file (overwrite each run)"""
-    # Create formatters
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    # Create formatters: emoji for the console, emoji-free text for the log file
+    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_formatter = _NoEmojiFormatter('%(asctime)s - %(levelname)s - %(message)s')
     
     # Setup root logger
     root_logger = logging.getLogger()
@@ -32,14 +54,13 @@ def setup_logging():
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(console_formatter)
     root_logger.addHandler(console_handler)
     
     # File handler (overwrite each run)
-    log_file = Path(__file__).parent / "browser_rendering_test.log"
-    file_handler = logging.FileHandler(log_file, mode='w')  # 'w' mode overwrites
+    file_handler = logging.FileHandler(_LOG_FILE, mode='w', encoding='utf-8')  # 'w' mode overwrites
     file_handler.setLevel(logging.DEBUG)  # More detailed logging to file
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(file_formatter)
     root_logger.addHandler(file_handler)
     
     return root_logger
@@ -47,6 +68,49 @@ def setup_logging():
 # Setup logging
 logger = setup_logging()
 
+# Binary responses are streamed to disk in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Backpressure and retry policy for the Browser Rendering API; concurrency can be tuned per account
+MAX_CONCURRENT_REQUESTS = int(os.getenv("BROWSER_RENDER_CONCURRENCY", "8"))
+MAX_REQUEST_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5  # seconds, doubled on each attempt
+
+# LinkedIn jobs scraped at once when several job IDs are given
+LINKEDIN_JOB_CONCURRENCY = 4
+
+# orjson parses responses and pretty-prints saved JSON several times faster; fall back to stdlib json when absent
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _json_fields(prompt: str, schema: Dict[str, Any]) -> bytes:
+    """Serialize the prompt/response_format members of a /json body, without the enclosing braces"""
+    return _dumps({
+        "prompt": prompt,
+        "response_format": {
+            "type": "json_schema",
+            "schema": schema
+        }
+    })[1:-1]
+
+# Pre-serialized /json fields for the module's constant prompt/schema pairs, keyed by prompt
+# and filled once at import below; any other prompt or schema is serialized per call
+_JSON_STATIC: Dict[str, tuple] = {}
+
 class CloudflareBrowserRenderingClient:
     """Client for Cloudflare Browser Rendering REST API"""
     
@@ -58,25 +122,102 @@ class CloudflareBrowserRenderingClient:
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json"
         }
+        
+        # The endpoint set is fixed, so build each URL once
+        self._endpoints = {
+            endpoint: f"{self.base_url}/{endpoint}"
+            for endpoint in ("screenshot", "content", "markdown", "json", "links", "scrape", "pdf")
+        }
+        
+        # Caps in-flight requests across every test sharing this client
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        # Shared HTTP session, opened by entering the client as an async context manager
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> "CloudflareBrowserRenderingClient":
+        # One session for the whole run so every request reuses keep-alive connections;
+        # the per-host cap leaves room for the LinkedIn fan-out to one host
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=75)
+        self.session = aiohttp.ClientSession(headers=self.headers, timeout=aiohttp.ClientTimeout(total=120), connector=connector)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.session.close()
+        self.session = None
+    
+    async def _post(self, session: aiohttp.ClientSession, endpoint: str, data: Union[Dict[str, Any], bytes], on_success: Callable[[aiohttp.ClientResponse], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """POST to an API endpoint, retrying 429/5xx and connection errors with exponential backoff"""
+        url = self._endpoints[endpoint]
+        # Serialize once up front (bodies may arrive pre-serialized); the session carries the JSON content type
+        body = data if isinstance(data, bytes) else _dumps(data)
+        
+        for attempt in range(1, MAX_REQUEST_ATTEMPTS + 1):
+            try:
+                # Auth headers are carried by the shared session
+                async with self._semaphore:
+                    async with session.post(url, data=body) as response:
+                        if response.status == 200:
+                            return await on_success(response)
+                        error_text = await response.text()
+                        error = f"API request failed: {response.status} - {error_text}"
+                        retryable = response.status == 429 or response.status >= 500
+            except aiohttp.ClientConnectionError as e:
+                error = f"API request failed: {e}"
+                retryable = True
+            
+            if not retryable or attempt == MAX_REQUEST_ATTEMPTS:
+                raise Exception(error)
+            
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) + random.uniform(0, RETRY_BASE_DELAY)
+            logger.warning("⚠️ %s attempt %s/%s failed, retrying in %.1fs: %s", endpoint, attempt, MAX_REQUEST_ATTEMPTS, delay, error)
+            await asyncio.sleep(delay)
     
-    async def _make_request(self, session: aiohttp.ClientSession, endpoint: str, data: Dict[str, Any], binary: bool = False) -> Dict[str, Any]:
+    async def _make_request(self, session: aiohttp.ClientSession, endpoint: str, data: Union[Dict[str, Any], bytes], binary: bool = False) -> Dict[str, Any]:
         """Make a request to the Cloudflare Browser Rendering API"""
-        url = f"{self.base_url}/{endpoint}"
-        
-        async with session.post(url, headers=self.headers, json=data) as response:
-            if response.status == 200:
-                if binary:
-                    # For binary responses (screenshots, PDFs), return the raw data
-                    content = await response.read()
-                    return {"success": True, "result": base64.b64encode(content).decode('utf-8')}
-                else:
-                    return await response.json()
-            else:
-                error_text = await response.text()
-                raise Exception(f"API request failed: {response.status} - {error_text}")
+        async def read(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+            if binary:
+                # For binary responses (screenshots, PDFs), return the raw bytes
+                content = await response.read()
+                return {"success": True, "result": content}
+            return await response.json(loads=_loads)
+        
+        return await self._post(session, endpoint, data, read)
+    
+    async def _download_to(self, session: aiohttp.ClientSession, endpoint: str, data: Dict[str, Any], dest_path: Path) -> Dict[str, Any]:
+        """Stream a binary API response straight into dest_path without buffering it in memory"""
+        async def stream(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+            # File I/O runs in worker threads so large PNG/PDF writes never block the event loop
+            f = await asyncio.to_thread(open, dest_path, "wb")
+            try:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+            except BaseException:
+                # Never leave a truncated asset behind
+                await asyncio.to_thread(f.close)
+                await asyncio.to_thread(dest_path.unlink, missing_ok=True)
+                raise
+            await asyncio.to_thread(f.close)
+            return {"success": True, "path": str(dest_path)}
+        
+        return await self._post(session, endpoint, data, stream)
+    
+    @staticmethod
+    def _apply_auth(data: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Add authentication and custom headers from options to a request body"""
+        if "username" in options and "password" in options:
+            data["authenticate"] = {
+                "username": options["username"],
+                "password": options["password"]
+            }
+        
+        if "headers" in options:
+            data["setExtraHTTPHeaders"] = options["headers"]
+        
+        return data
     
-    async def take_screenshot(self, session: aiohttp.ClientSession, url: str, **options) -> Dict[str, Any]:
-        """Take a screenshot of a webpage"""
+    async def take_screenshot(self, session: aiohttp.ClientSession, url: str, dest_path: Optional[Path] = None, **options) -> Dict[str, Any]:
+        """Take a screenshot of a webpage; the result is the raw image bytes, or is streamed to dest_path if given"""
         data = {
             "url": url,
             "screenshotOptions": {
@@ -90,17 +231,10 @@ class CloudflareBrowserRenderingClient:
             }
         }
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
+        if dest_path is not None:
+            return await self._download_to(session, "screenshot", data, dest_path)
         return await self._make_request(session, "screenshot", data, binary=True)
     
     async def extract_content(self, session: aiohttp.ClientSession, url: str, **options) -> Dict[str, Any]:
@@ -110,16 +244,7 @@ class CloudflareBrowserRenderingClient:
             "rejectResourceTypes": options.get("rejectResourceTypes", [])
         }
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
         return await self._make_request(session, "content", data)
     
@@ -127,57 +252,29 @@ class CloudflareBrowserRenderingClient:
         """Extract markdown content from a webpage"""
         data = {"url": url}
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
         return await self._make_request(session, "markdown", data)
     
     async def extract_json(self, session: aiohttp.ClientSession, url: str, prompt: str, schema: Dict[str, Any], **options) -> Dict[str, Any]:
         """Extract structured JSON data from a webpage using AI"""
-        data = {
-            "url": url,
-            "prompt": prompt,
-            "response_format": {
-                "type": "json_schema",
-                "schema": schema
-            }
-        }
-        
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
+        # The module's constant prompt/schema pairs were serialized at import; only url and auth vary per job
+        static = _JSON_STATIC.get(prompt)
+        if static is not None and static[0] is schema:
+            fields = static[1]
+        else:
+            fields = _json_fields(prompt, schema)
         
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        data = self._apply_auth({"url": url}, options)
+        body = _dumps(data)[:-1] + b"," + fields + b"}"
         
-        return await self._make_request(session, "json", data)
+        return await self._make_request(session, "json", body)
     
     async def extract_links(self, session: aiohttp.ClientSession, url: str, **options) -> Dict[str, Any]:
         """Extract links from a webpage"""
         data = {"url": url}
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
         return await self._make_request(session, "links", data)
     
@@ -188,21 +285,12 @@ class CloudflareBrowserRenderingClient:
             "elements": selectors
         }
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
         return await self._make_request(session, "scrape", data)
     
-    async def generate_pdf(self, session: aiohttp.ClientSession, url: str, **options) -> Dict[str, Any]:
-        """Generate a PDF from a webpage"""
+    async def generate_pdf(self, session: aiohttp.ClientSession, url: str, dest_path: Optional[Path] = None, **options) -> Dict[str, Any]:
+        """Generate a PDF from a webpage; the result is the raw PDF bytes, or is streamed to dest_path if given"""
         data = {
             "url": url,
             "pdfOptions": {
@@ -211,562 +299,630 @@ class CloudflareBrowserRenderingClient:
             }
         }
         
-        # Add authentication if provided
-        if "username" in options and "password" in options:
-            data["authenticate"] = {
-                "username": options["username"],
-                "password": options["password"]
-            }
-        
-        # Add custom headers if provided
-        if "headers" in options:
-            data["setExtraHTTPHeaders"] = options["headers"]
+        self._apply_auth(data, options)
         
+        if dest_path is not None:
+            return await self._download_to(session, "pdf", data, dest_path)
         return await self._make_request(session, "pdf", data, binary=True)
 
+class BackgroundSaveContext:
+    """Writes assets on a small thread pool so tests need not wait for the disk; leaving the context waits for every write"""
+    
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+    
+    async def __aenter__(self) -> "BackgroundSaveContext":
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-writer")
+        return self
+    
+    def submit(self, path: Path, data: bytes) -> None:
+        """Queue data to be written to path"""
+        self._futures.append(self._executor.submit(path.write_bytes, data))
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            results = await asyncio.gather(*(asyncio.wrap_future(f) for f in self._futures), return_exceptions=True)
+        finally:
+            self._executor.shutdown(wait=False)
+        
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and exc_type is None:
+            raise errors[0]
+
 class AssetManager:
     """Manages saving assets locally and to R2 bucket"""
     
-    def __init__(self, local_assets_dir: str, r2_bucket_url: Optional[str] = None):
+    def __init__(self, local_assets_dir: str, r2_bucket_url: Optional[str] = None, saver: Optional[BackgroundSaveContext] = None):
         self.local_assets_dir = Path(local_assets_dir)
         self.local_assets_dir.mkdir(parents=True, exist_ok=True)
         self.r2_bucket_url = r2_bucket_url
+        self.saver = saver
+    
+    async def _write(self, local_path: Path, data: bytes) -> None:
+        """Write data off the event loop, in the background when a saver is attached"""
+        if self.saver is not None:
+            self.saver.submit(local_path, data)
+        else:
+            await asyncio.to_thread(local_path.write_bytes, data)
     
-    def save_asset(self, filename: str, data: bytes, asset_type: str = "binary") -> str:
+    async def save_asset(self, filename: str, data: bytes, asset_type: str = "binary") -> str:
         """Save asset locally and optionally to R2 bucket"""
-        # Save locally
+        # Save locally, off the event loop
         local_path = self.local_assets_dir / filename
-        local_path.write_bytes(data)
-        logger.info(f"💾 Asset saved locally: {local_path}")
+        await self._write(local_path, data)
+        logger.info("💾 Asset saved locally: %s", local_path)
         
         # TODO: Add R2 bucket upload functionality
         # This would require additional R2 SDK setup
         if self.r2_bucket_url:
-            logger.info(f"📦 R2 upload would go to: {self.r2_bucket_url}/{filename}")
+            logger.info("📦 R2 upload would go to: %s/%s", self.r2_bucket_url, filename)
+        
+        return str(local_path)
+    
+    def asset_path(self, filename: str) -> Path:
+        """Local path an asset with this filename is saved to"""
+        return self.local_assets_dir / filename
+    
+    async def record_asset(self, filename: str) -> str:
+        """Record an asset already written to asset_path(filename), e.g. by a streamed download"""
+        local_path = self.asset_path(filename)
+        logger.info("💾 Asset saved locally: %s", local_path)
+        
+        if self.r2_bucket_url:
+            logger.info("📦 R2 upload would go to: %s/%s", self.r2_bucket_url, filename)
         
         return str(local_path)
     
-    def save_text_asset(self, filename: str, content: str) -> str:
+    async def save_text_asset(self, filename: str, content: str) -> str:
         """Save text asset locally and optionally to R2 bucket"""
-        # Save locally
+        # Save locally, off the event loop
         local_path = self.local_assets_dir / filename
-        local_path.write_text(content, encoding='utf-8')
-        logger.info(f"💾 Text asset saved locally: {local_path}")
+        await self._write(local_path, content.encode('utf-8'))
+        logger.info("💾 Text asset saved locally: %s", local_path)
         
         # TODO: Add R2 bucket upload functionality
         if self.r2_bucket_url:
-            logger.info(f"📦 R2 upload would go to: {self.r2_bucket_url}/{filename}")
+            logger.info("📦 R2 upload would go to: %s/%s", self.r2_bucket_url, filename)
         
         return str(local_path)
 
+# Result handlers save one task's output under the given filename and return its path (None if nothing was saved)
+async def _save_text(asset_manager: AssetManager, filename: str, task_data: Any) -> Optional[str]:
+    return await asset_manager.save_text_asset(filename, task_data)
+
+async def _save_json(asset_manager: AssetManager, filename: str, task_data: Any) -> Optional[str]:
+    return await asset_manager.save_asset(filename, _dumps_pretty(task_data), "json")
+
+async def _save_json_output(asset_manager: AssetManager, filename: str, task_data: Any) -> Optional[str]:
+    if isinstance(task_data, dict) and "output" in task_data:
+        return await _save_json(asset_manager, filename, task_data["output"])
+    return None
+
+async def _record_streamed(asset_manager: AssetManager, filename: str, task_data: Any) -> Optional[str]:
+    # Binary tasks were already streamed to asset_path(filename)
+    return await asset_manager.record_asset(filename)
+
+# task name -> (filename suffix, handler)
+_LINKEDIN_HANDLERS = {
+    "content": ("content.html", _save_text),
+    "screenshot-viewport": ("screenshot-viewport.png", _record_streamed),
+    "screenshot-fullpage": ("screenshot-fullpage.png", _record_streamed),
+    "markdown": ("markdown.md", _save_text),
+    "json-data": ("data.json", _save_json_output),
+    "links": ("links.json", _save_json),
+    "scraped-elements": ("scraped.json", _save_json),
+    "pdf": ("document.pdf", _record_streamed)
+}
+
+_COMPREHENSIVE_HANDLERS = {
+    "content": ("content.html", _save_text),
+    "screenshot": ("screenshot.png", _record_streamed),
+    "markdown": ("markdown.md", _save_text),
+    "json": ("json.json", _save_json_output),
+    "links": ("links.json", _save_json),
+    "scraped": ("scraped.json", _save_json)
+}
+
+# KEY=value lines, skipping blanks and # comments; the key is trimmed and the value runs to end of line
+_DEV_VAR_PATTERN = re.compile(r'^[ \t]*([^#\s=][^=\n]*?)[ \t]*=(.*?)[ \t]*$', re.MULTILINE)
+
 def load_dev_vars() -> Dict[str, str]:
     """Load environment variables from .dev.vars file"""
-    # Look for .dev.vars in the project root (two levels up from scripts/tests/)
-    dev_vars_path = Path(__file__).parent.parent.parent / ".dev.vars"
+    dev_vars_path = _DEV_VARS_FILE
     env_vars = {}
     
     if dev_vars_path.exists():
-        with open(dev_vars_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    # Remove quotes if present
-                    value = value.strip('"\'')
-                    env_vars[key.strip()] = value
+        # One regex pass over the whole file; quotes are removed if present
+        text = dev_vars_path.read_text(encoding='utf-8')
+        env_vars = {key: value.strip('"\'') for key, value in _DEV_VAR_PATTERN.findall(text)}
         logger.info("✅ Configuration loaded from .dev.vars")
     else:
         logger.warning("⚠️ .dev.vars file not found, using environment variables")
     
     return env_vars
 
-async def test_basic_screenshot(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+@dataclass(frozen=True)
+class Config:
+    """Credentials for the test run, from .dev.vars with environment fallbacks"""
+    api_token: Optional[str]
+    account_id: Optional[str]
+    linkedin_username: Optional[str]
+    linkedin_password: Optional[str]
+    # R2 upload worker settings; the environment takes precedence here, as in r2_uploader
+    worker_url: Optional[str] = None
+    worker_api_key: Optional[str] = None
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Resolve the run configuration once; later calls return the cached Config"""
+    dev_vars = load_dev_vars()
+    return Config(
+        api_token=dev_vars.get("BROWSER_RENDERING_TOKEN") or os.getenv("CLOUDFLARE_API_TOKEN"),
+        account_id=dev_vars.get("CLOUDFLARE_ACCOUNT_ID") or os.getenv("CLOUDFLARE_ACCOUNT_ID"),
+        linkedin_username=dev_vars.get("LINKEDIN_USERNAME") or os.getenv("LINKEDIN_USERNAME"),
+        linkedin_password=dev_vars.get("LINKEDIN_PASSWORD") or os.getenv("LINKEDIN_PASSWORD"),
+        worker_url=os.getenv("WORKER_URL") or dev_vars.get("WORKER_URL"),
+        worker_api_key=os.getenv("WORKER_API_KEY") or dev_vars.get("WORKER_API_KEY")
+    )
+
+async def test_basic_screenshot(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
     """Test basic screenshot functionality"""
     logger.info("📸 Testing basic screenshot...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            result = await client.take_screenshot(session, "https://example.com")
-            
-            if result.get("success") and result.get("result"):
-                # Decode base64 screenshot data
-                screenshot_data = base64.b64decode(result["result"])
-                
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-                filename = f"screenshot-{timestamp}.png"
-                file_path = asset_manager.save_asset(filename, screenshot_data, "binary")
-                
-                logger.info(f"✅ Screenshot captured and saved: {file_path}")
-                return file_path
-            else:
-                logger.error(f"❌ Screenshot failed: {result}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Screenshot test failed: {e}")
-            return None
+    try:
+        timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+        filename = f"screenshot-{timestamp}.png"
+        result = await client.take_screenshot(session, "https://example.com", dest_path=asset_manager.asset_path(filename))
+        
+        if result.get("success") and result.get("path"):
+            file_path = await asset_manager.record_asset(filename)
+            
+            logger.info("✅ Screenshot captured and saved: %s", file_path)
+            return [file_path]
+        else:
+            logger.error("❌ Screenshot failed: %s", result)
+            return []
+            
+    except Exception as e:
+        logger.error("❌ Screenshot test failed: %s", e)
+        return []
 
-async def test_content_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+async def test_content_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
     """Test HTML content extraction"""
     logger.info("📄 Testing content extraction...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            result = await client.extract_content(
-                session, 
-                "https://example.com",
-                rejectResourceTypes=["image", "stylesheet"]
-            )
-            
-            if result.get("success") and result.get("result"):
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-                filename = f"content-{timestamp}.html"
-                file_path = asset_manager.save_text_asset(filename, result["result"])
-                
-                logger.info(f"✅ Content extracted and saved: {file_path}")
-                return file_path
-            else:
-                logger.error(f"❌ Content extraction failed: {result}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Content extraction test failed: {e}")
-            return None
+    try:
+        result = await client.extract_content(
+            session, 
+            "https://example.com",
+            rejectResourceTypes=["image", "stylesheet"]
+        )
+        
+        if result.get("success") and result.get("result"):
+            timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+            filename = f"content-{timestamp}.html"
+            file_path = await asset_manager.save_text_asset(filename, result["result"])
+            
+            logger.info("✅ Content extracted and saved: %s", file_path)
+            return [file_path]
+        else:
+            logger.error("❌ Content extraction failed: %s", result)
+            return []
+            
+    except Exception as e:
+        logger.error("❌ Content extraction test failed: %s", e)
+        return []
 
-async def test_markdown_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+async def test_markdown_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
     """Test markdown extraction"""
     logger.info("📝 Testing markdown extraction...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            result = await client.extract_markdown(session, "https://example.com")
-            
-            if result.get("success") and result.get("result"):
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-                filename = f"markdown-{timestamp}.md"
-                file_path = asset_manager.save_text_asset(filename, result["result"])
-                
-                logger.info(f"✅ Markdown extracted and saved: {file_path}")
-                return file_path
-            else:
-                logger.error(f"❌ Markdown extraction failed: {result}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Markdown extraction test failed: {e}")
-            return None
+    try:
+        result = await client.extract_markdown(session, "https://example.com")
+        
+        if result.get("success") and result.get("result"):
+            timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+            filename = f"markdown-{timestamp}.md"
+            file_path = await asset_manager.save_text_asset(filename, result["result"])
+            
+            logger.info("✅ Markdown extracted and saved: %s", file_path)
+            return [file_path]
+        else:
+            logger.error("❌ Markdown extraction failed: %s", result)
+            return []
+            
+    except Exception as e:
+        logger.error("❌ Markdown extraction test failed: %s", e)
+        return []
 
-async def test_json_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+# Shared by the JSON extraction and comprehensive tests; serialized once at import below
+_PAGE_INFO_PROMPT = "Extract key information from this page"
+_PAGE_INFO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "headings": {"type": "array", "items": {"type": "string"}}
+    }
+}
+_JSON_STATIC[_PAGE_INFO_PROMPT] = (_PAGE_INFO_SCHEMA, _json_fields(_PAGE_INFO_PROMPT, _PAGE_INFO_SCHEMA))
+
+async def test_json_extraction(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
     """Test JSON extraction with AI"""
     logger.info("📊 Testing JSON extraction...")
     
-    schema = {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string"},
-            "description": {"type": "string"},
-            "headings": {"type": "array", "items": {"type": "string"}}
-        }
-    }
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            result = await client.extract_json(
-                session,
-                "https://example.com",
-                "Extract key information from this page",
-                schema
-            )
-            
-            if result.get("success") and result.get("result"):
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-                filename = f"json-{timestamp}.json"
-                
-                # Handle both direct result and nested output
-                json_data = result["result"]
-                if isinstance(json_data, dict) and "output" in json_data:
-                    json_data = json_data["output"]
-                
-                json_content = json.dumps(json_data, indent=2)
-                file_path = asset_manager.save_text_asset(filename, json_content)
-                
-                logger.info(f"✅ JSON extracted and saved: {file_path}")
-                return file_path
-            else:
-                logger.error(f"❌ JSON extraction failed: {result}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ JSON extraction test failed: {e}")
-            return None
+    try:
+        result = await client.extract_json(
+            session,
+            "https://example.com",
+            _PAGE_INFO_PROMPT,
+            _PAGE_INFO_SCHEMA
+        )
+        
+        if result.get("success") and result.get("result"):
+            timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+            filename = f"json-{timestamp}.json"
+            
+            # Handle both direct result and nested output
+            json_data = result["result"]
+            if isinstance(json_data, dict) and "output" in json_data:
+                json_data = json_data["output"]
+            
+            file_path = await asset_manager.save_asset(filename, _dumps_pretty(json_data), "json")
+            
+            logger.info("✅ JSON extracted and saved: %s", file_path)
+            return [file_path]
+        else:
+            logger.error("❌ JSON extraction failed: %s", result)
+            return []
+            
+    except Exception as e:
+        logger.error("❌ JSON extraction test failed: %s", e)
+        return []
 
-async def test_pdf_generation(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+async def test_pdf_generation(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
     """Test PDF generation"""
     logger.info("📄 Testing PDF generation...")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            result = await client.generate_pdf(session, "https://example.com")
-            
-            if result.get("success") and result.get("result"):
-                # Decode base64 PDF data
-                pdf_data = base64.b64decode(result["result"])
-                
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-                filename = f"pdf-{timestamp}.pdf"
-                file_path = asset_manager.save_asset(filename, pdf_data, "binary")
-                
-                logger.info(f"✅ PDF generated and saved: {file_path}")
-                return file_path
-            else:
-                logger.error(f"❌ PDF generation failed: {result}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ PDF generation test failed: {e}")
-            return None
+    try:
+        timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+        filename = f"pdf-{timestamp}.pdf"
+        result = await client.generate_pdf(session, "https://example.com", dest_path=asset_manager.asset_path(filename))
+        
+        if result.get("success") and result.get("path"):
+            file_path = await asset_manager.record_asset(filename)
+            
+            logger.info("✅ PDF generated and saved: %s", file_path)
+            return [file_path]
+        else:
+            logger.error("❌ PDF generation failed: %s", result)
+            return []
+            
+    except Exception as e:
+        logger.error("❌ PDF generation test failed: %s", e)
+        return []
+
+# LinkedIn-specific headers (these constants are built once and shared by every scraped job)
+_LINKEDIN_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+}
 
-async def test_linkedin_job_scraping(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, job_id: str, username: str, password: str):
+# AI extraction prompt and LinkedIn job data schema
+_LINKEDIN_JOB_PROMPT = "Extract comprehensive job posting information from this LinkedIn job posting. Include job title, company name, location, employment type, salary range, job description, required qualifications/skills, preferred qualifications/skills, benefits and perks, application deadline, remote work options, experience level required, industry/sector"
+_LINKEDIN_JOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "company": {"type": "string"},
+        "location": {"type": "string"},
+        "employmentType": {"type": "string"},
+        "salaryRange": {"type": "string"},
+        "description": {"type": "string"},
+        "requiredSkills": {"type": "array", "items": {"type": "string"}},
+        "preferredSkills": {"type": "array", "items": {"type": "string"}},
+        "benefits": {"type": "array", "items": {"type": "string"}},
+        "applicationDeadline": {"type": "string"},
+        "remoteWork": {"type": "string"},
+        "experienceLevel": {"type": "string"},
+        "industry": {"type": "string"},
+        "jobUrl": {"type": "string"},
+        "postedDate": {"type": "string"}
+    },
+    "required": ["title", "company", "location", "description"]
+}
+_JSON_STATIC[_LINKEDIN_JOB_PROMPT] = (_LINKEDIN_JOB_SCHEMA, _json_fields(_LINKEDIN_JOB_PROMPT, _LINKEDIN_JOB_SCHEMA))
+
+# LinkedIn-specific selectors
+_LINKEDIN_SELECTORS = [
+    {"selector": "h1.job-title"},
+    {"selector": ".job-details-jobs-unified-top-card__company-name"},
+    {"selector": ".job-details-jobs-unified-top-card__bullet"},
+    {"selector": ".job-details-jobs-unified-top-card__salary"},
+    {"selector": ".jobs-description-content__text"},
+    {"selector": ".jobs-unified-top-card__job-insight"}
+]
+
+async def test_linkedin_job_scraping(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession, job_id: str, username: str, password: str):
     """Test LinkedIn job scraping with authentication - FULL GAMBIT"""
-    logger.info(f"🔗 Testing LinkedIn job scraping for job ID: {job_id} - FULL GAMBIT")
+    logger.info("🔗 Testing LinkedIn job scraping for job ID: %s - FULL GAMBIT", job_id)
     
     url = f"https://linkedin.com/jobs/view/{job_id}"
     
-    # LinkedIn-specific headers
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9"
-    }
+    timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
+    job_prefix = f"linkedin-job-{job_id}-{timestamp}"
     
-    # LinkedIn job data schema
-    job_schema = {
-        "type": "object",
-        "properties": {
-            "title": {"type": "string"},
-            "company": {"type": "string"},
-            "location": {"type": "string"},
-            "employmentType": {"type": "string"},
-            "salaryRange": {"type": "string"},
-            "description": {"type": "string"},
-            "requiredSkills": {"type": "array", "items": {"type": "string"}},
-            "preferredSkills": {"type": "array", "items": {"type": "string"}},
-            "benefits": {"type": "array", "items": {"type": "string"}},
-            "applicationDeadline": {"type": "string"},
-            "remoteWork": {"type": "string"},
-            "experienceLevel": {"type": "string"},
-            "industry": {"type": "string"},
-            "jobUrl": {"type": "string"},
-            "postedDate": {"type": "string"}
-        },
-        "required": ["title", "company", "location", "description"]
-    }
-    
-    # LinkedIn-specific selectors
-    selectors = [
-        {"selector": "h1.job-title"},
-        {"selector": ".job-details-jobs-unified-top-card__company-name"},
-        {"selector": ".job-details-jobs-unified-top-card__bullet"},
-        {"selector": ".job-details-jobs-unified-top-card__salary"},
-        {"selector": ".jobs-description-content__text"},
-        {"selector": ".jobs-unified-top-card__job-insight"}
-    ]
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Execute ALL operations in parallel - FULL GAMBIT
-            tasks = [
-                # Content extraction
-                client.extract_content(session, url, username=username, password=password, headers=headers),
-                
-                # Screenshots (viewport and full page)
-                client.take_screenshot(session, url, username=username, password=password, headers=headers, fullPage=False, width=1920, height=1080),
-                client.take_screenshot(session, url, username=username, password=password, headers=headers, fullPage=True),
-                
-                # Markdown extraction
-                client.extract_markdown(session, url, username=username, password=password, headers=headers),
-                
-                # JSON extraction with AI
-                client.extract_json(
-                    session, url,
-                    "Extract comprehensive job posting information from this LinkedIn job posting. Include job title, company name, location, employment type, salary range, job description, required qualifications/skills, preferred qualifications/skills, benefits and perks, application deadline, remote work options, experience level required, industry/sector",
-                    job_schema,
-                    username=username, password=password, headers=headers
-                ),
-                
-                # Links extraction
-                client.extract_links(session, url, username=username, password=password, headers=headers),
-                
-                # Element scraping
-                client.scrape_elements(session, url, selectors, username=username, password=password, headers=headers),
-                
-                # PDF generation
-                client.generate_pdf(session, url, username=username, password=password, headers=headers, format="a4")
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-            job_prefix = f"linkedin-job-{job_id}-{timestamp}"
-            saved_files = []
-            
-            # Process results with descriptive names
-            task_names = [
-                "content", "screenshot-viewport", "screenshot-fullpage", 
-                "markdown", "json-data", "links", "scraped-elements", "pdf"
-            ]
-            
-            for i, (result, task_name) in enumerate(zip(results, task_names)):
-                if isinstance(result, Exception):
-                    logger.error(f"❌ {task_name} task failed: {result}")
-                    continue
-                
-                if not result.get("success"):
-                    logger.error(f"❌ {task_name} task returned unsuccessful: {result}")
-                    continue
-                
-                task_data = result.get("result")
-                if not task_data:
-                    continue
-                
-                # Process based on task type
-                if task_name == "content":
-                    filename = f"{job_prefix}-content.html"
-                    file_path = asset_manager.save_text_asset(filename, task_data)
-                    saved_files.append(file_path)
-                
-                elif task_name in ["screenshot-viewport", "screenshot-fullpage"]:
-                    filename = f"{job_prefix}-{task_name}.png"
-                    screenshot_data = base64.b64decode(task_data)
-                    file_path = asset_manager.save_asset(filename, screenshot_data, "binary")
-                    saved_files.append(file_path)
-                
-                elif task_name == "markdown":
-                    filename = f"{job_prefix}-markdown.md"
-                    file_path = asset_manager.save_text_asset(filename, task_data)
-                    saved_files.append(file_path)
-                
-                elif task_name == "json-data":
-                    if isinstance(task_data, dict) and "output" in task_data:
-                        filename = f"{job_prefix}-data.json"
-                        json_content = json.dumps(task_data["output"], indent=2)
-                        file_path = asset_manager.save_text_asset(filename, json_content)
-                        saved_files.append(file_path)
-                
-                elif task_name == "links":
-                    filename = f"{job_prefix}-links.json"
-                    json_content = json.dumps(task_data, indent=2)
-                    file_path = asset_manager.save_text_asset(filename, json_content)
-                    saved_files.append(file_path)
-                
-                elif task_name == "scraped-elements":
-                    filename = f"{job_prefix}-scraped.json"
-                    json_content = json.dumps(task_data, indent=2)
-                    file_path = asset_manager.save_text_asset(filename, json_content)
-                    saved_files.append(file_path)
-                
-                elif task_name == "pdf":
-                    filename = f"{job_prefix}-document.pdf"
-                    pdf_data = base64.b64decode(task_data)
-                    file_path = asset_manager.save_asset(filename, pdf_data, "binary")
-                    saved_files.append(file_path)
-            
-            # Print comprehensive summary
-            if saved_files:
-                logger.info(f"\n🎯 LinkedIn Job Scraping - FULL GAMBIT COMPLETE!")
-                logger.info(f"📁 Generated {len(saved_files)} assets:")
-                for file_path in saved_files:
-                    logger.info(f"   {file_path}")
-                
-                # Log file reference for AI agents
-                log_file = Path(__file__).parent / "browser_rendering_test.log"
-                logger.info(f"\n📋 Detailed logs available at: {log_file}")
-                logger.info(f"🤖 AI Agent: Review the log file for comprehensive test details")
-            else:
-                logger.warning("⚠️ No assets were generated from LinkedIn job scraping")
+    try:
+        # Execute ALL operations in parallel - FULL GAMBIT
+        tasks = [
+            # Content extraction
+            client.extract_content(session, url, username=username, password=password, headers=_LINKEDIN_HEADERS),
             
-            return saved_files
+            # Screenshots (viewport and full page)
+            client.take_screenshot(session, url, dest_path=asset_manager.asset_path(f"{job_prefix}-screenshot-viewport.png"), username=username, password=password, headers=_LINKEDIN_HEADERS, fullPage=False, width=1920, height=1080),
+            client.take_screenshot(session, url, dest_path=asset_manager.asset_path(f"{job_prefix}-screenshot-fullpage.png"), username=username, password=password, headers=_LINKEDIN_HEADERS, fullPage=True),
             
-        except Exception as e:
-            logger.error(f"❌ LinkedIn job scraping failed: {e}")
-            return []
+            # Markdown extraction
+            client.extract_markdown(session, url, username=username, password=password, headers=_LINKEDIN_HEADERS),
+            
+            # JSON extraction with AI
+            client.extract_json(
+                session, url,
+                _LINKEDIN_JOB_PROMPT,
+                _LINKEDIN_JOB_SCHEMA,
+                username=username, password=password, headers=_LINKEDIN_HEADERS
+            ),
+            
+            # Links extraction
+            client.extract_links(session, url, username=username, password=password, headers=_LINKEDIN_HEADERS),
+            
+            # Element scraping
+            client.scrape_elements(session, url, _LINKEDIN_SELECTORS, username=username, password=password, headers=_LINKEDIN_HEADERS),
+            
+            # PDF generation
+            client.generate_pdf(session, url, dest_path=asset_manager.asset_path(f"{job_prefix}-document.pdf"), username=username, password=password, headers=_LINKEDIN_HEADERS, format="a4")
+        ]
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        pending_saves = []
+        
+        # Process results with descriptive names
+        task_names = [
+            "content", "screenshot-viewport", "screenshot-fullpage", 
+            "markdown", "json-data", "links", "scraped-elements", "pdf"
+        ]
+        
+        for result, task_name in zip(results, task_names):
+            if isinstance(result, Exception):
+                logger.error("❌ %s task failed: %s", task_name, result)
+                continue
+            
+            if not result.get("success"):
+                logger.error("❌ %s task returned unsuccessful: %s", task_name, result)
+                continue
+            
+            # Binary tasks stream straight to disk and report a path instead of a result
+            task_data = result.get("result", result.get("path"))
+            if not task_data:
+                continue
+            
+            suffix, handler = _LINKEDIN_HANDLERS[task_name]
+            pending_saves.append(asyncio.create_task(handler(asset_manager, f"{job_prefix}-{suffix}", task_data)))
+        
+        # Let the writes overlap with result processing, then wait for them all
+        saved_files = [path for path in await asyncio.gather(*pending_saves) if path]
+        
+        # Print comprehensive summary
+        if saved_files:
+            logger.info("\n🎯 LinkedIn Job Scraping - FULL GAMBIT COMPLETE!")
+            logger.info("📁 Generated %s assets:\n%s", len(saved_files), "\n".join(f"   {file_path}" for file_path in saved_files))
+            
+            # Log file reference for AI agents
+            logger.info("\n📋 Detailed logs available at: %s", _LOG_FILE)
+            logger.info("🤖 AI Agent: Review the log file for comprehensive test details")
+        else:
+            logger.warning("⚠️ No assets were generated from LinkedIn job scraping")
+        
+        return saved_files
+        
+    except Exception as e:
+        logger.error("❌ LinkedIn job scraping failed: %s", e)
+        return []
+
+async def run_basic_tests(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession) -> List[str]:
+    """Run the five basic tests concurrently and return the files they saved"""
+    results = await asyncio.gather(
+        test_basic_screenshot(client, asset_manager, session),
+        test_content_extraction(client, asset_manager, session),
+        test_markdown_extraction(client, asset_manager, session),
+        test_json_extraction(client, asset_manager, session),
+        test_pdf_generation(client, asset_manager, session),
+        return_exceptions=True
+    )
+    
+    # One failing test must not discard the others' files
+    saved_files = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("❌ Basic test failed: %s", result)
+        else:
+            saved_files.extend(result)
+    return saved_files
+
+async def run_linkedin_jobs(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession, job_ids: List[str], username: str, password: str) -> List[str]:
+    """Scrape several LinkedIn jobs concurrently over the shared session"""
+    job_slots = asyncio.Semaphore(LINKEDIN_JOB_CONCURRENCY)
+    
+    async def scrape(job_id: str) -> List[str]:
+        async with job_slots:
+            return await test_linkedin_job_scraping(client, asset_manager, session, job_id, username, password)
+    
+    results = await asyncio.gather(*(scrape(job_id) for job_id in job_ids))
+    return [file_path for job_files in results for file_path in job_files]
 
-async def run_comprehensive_test(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager):
+async def run_comprehensive_test(client: CloudflareBrowserRenderingClient, asset_manager: AssetManager, session: aiohttp.ClientSession):
     """Run comprehensive test with multiple operations"""
     logger.info("🔄 Running comprehensive test...")
     
     url = "https://example.com"
-    timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+    timestamp = time.strftime("%Y-%m-%dT%H-%M-%S")
     comp_prefix = f"comprehensive-{timestamp}"
-    saved_files = []
+    pending_saves = []
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Execute multiple operations in parallel
-            tasks = [
-                client.extract_content(session, url),
-                client.take_screenshot(session, url, fullPage=True),
-                client.extract_markdown(session, url),
-                client.extract_json(
-                    session, url,
-                    "Extract key information from this page",
-                    {
-                        "type": "object",
-                        "properties": {
-                            "title": {"type": "string"},
-                            "description": {"type": "string"},
-                            "headings": {"type": "array", "items": {"type": "string"}}
-                        }
-                    }
-                ),
-                client.extract_links(session, url),
-                client.scrape_elements(session, url, [{"selector": "h1, h2, h3"}])
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            task_names = ["content", "screenshot", "markdown", "json", "links", "scraped"]
-            
-            for i, (result, task_name) in enumerate(zip(results, task_names)):
-                if isinstance(result, Exception):
-                    logger.error(f"❌ {task_name} task failed: {result}")
-                    continue
-                
-                if not result.get("success"):
-                    logger.error(f"❌ {task_name} task returned unsuccessful: {result}")
-                    continue
-                
-                task_data = result.get("result")
-                if not task_data:
-                    continue
-                
-                if task_name == "screenshot":
-                    filename = f"{comp_prefix}-{task_name}.png"
-                    screenshot_data = base64.b64decode(task_data)
-                    file_path = asset_manager.save_asset(filename, screenshot_data, "binary")
-                    saved_files.append(file_path)
-                
-                elif task_name == "json" and isinstance(task_data, dict) and "output" in task_data:
-                    filename = f"{comp_prefix}-{task_name}.json"
-                    json_content = json.dumps(task_data["output"], indent=2)
-                    file_path = asset_manager.save_text_asset(filename, json_content)
-                    saved_files.append(file_path)
-                
-                else:
-                    filename = f"{comp_prefix}-{task_name}.{'json' if task_name in ['links', 'scraped'] else 'html' if task_name == 'content' else 'md'}"
-                    
-                    if task_name in ["links", "scraped"]:
-                        json_content = json.dumps(task_data, indent=2)
-                        file_path = asset_manager.save_text_asset(filename, json_content)
-                    else:
-                        file_path = asset_manager.save_text_asset(filename, task_data)
-                    
-                    saved_files.append(file_path)
-            
-            # Print summary
-            if saved_files:
-                logger.info(f"\n📁 Comprehensive Test Assets ({len(saved_files)} files):")
-                for file_path in saved_files:
-                    logger.info(f"   {file_path}")
-            
-            return saved_files
+    try:
+        # Execute multiple operations in parallel
+        tasks = [
+            client.extract_content(session, url),
+            client.take_screenshot(session, url, dest_path=asset_manager.asset_path(f"{comp_prefix}-screenshot.png"), fullPage=True),
+            client.extract_markdown(session, url),
+            client.extract_json(
+                session, url,
+                _PAGE_INFO_PROMPT,
+                _PAGE_INFO_SCHEMA
+            ),
+            client.extract_links(session, url),
+            client.scrape_elements(session, url, [{"selector": "h1, h2, h3"}])
+        ]
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Process results
+        task_names = ["content", "screenshot", "markdown", "json", "links", "scraped"]
+        
+        for result, task_name in zip(results, task_names):
+            if isinstance(result, Exception):
+                logger.error("❌ %s task failed: %s", task_name, result)
+                continue
             
-        except Exception as e:
-            logger.error(f"❌ Comprehensive test failed: {e}")
-            return []
+            if not result.get("success"):
+                logger.error("❌ %s task returned unsuccessful: %s", task_name, result)
+                continue
+            
+            # Binary tasks stream straight to disk and report a path instead of a result
+            task_data = result.get("result", result.get("path"))
+            if not task_data:
+                continue
+            
+            suffix, handler = _COMPREHENSIVE_HANDLERS[task_name]
+            pending_saves.append(asyncio.create_task(handler(asset_manager, f"{comp_prefix}-{suffix}", task_data)))
+        
+        saved_files = [path for path in await asyncio.gather(*pending_saves) if path]
+        
+        # Print summary
+        if saved_files:
+            logger.info("\n📁 Comprehensive Test Assets (%s files):\n%s", len(saved_files), "\n".join(f"   {file_path}" for file_path in saved_files))
+        
+        return saved_files
+        
+    except Exception as e:
+        logger.error("❌ Comprehensive test failed: %s", e)
+        return []
 
 async def main():
     """Main test function"""
     parser = argparse.ArgumentParser(description="Test Cloudflare Browser Rendering API")
-    parser.add_argument("--linkedin-job-id", help="LinkedIn job ID to test scraping")
+    parser.add_argument("--linkedin-job-id", "--linkedin-job-ids", dest="linkedin_job_ids", nargs="+", help="LinkedIn job ID(s) to test scraping")
     parser.add_argument("--comprehensive", action="store_true", help="Run comprehensive test")
     parser.add_argument("--basic", action="store_true", help="Run basic tests")
     args = parser.parse_args()
     
     # Load configuration
-    dev_vars = load_dev_vars()
-    
-    api_token = dev_vars.get("BROWSER_RENDERING_TOKEN") or os.getenv("CLOUDFLARE_API_TOKEN")
-    account_id = dev_vars.get("CLOUDFLARE_ACCOUNT_ID") or os.getenv("CLOUDFLARE_ACCOUNT_ID")
-    linkedin_username = dev_vars.get("LINKEDIN_USERNAME") or os.getenv("LINKEDIN_USERNAME")
-    linkedin_password = dev_vars.get("LINKEDIN_PASSWORD") or os.getenv("LINKEDIN_PASSWORD")
+    config = get_config()
+    api_token = config.api_token
+    account_id = config.account_id
+    linkedin_username = config.linkedin_username
+    linkedin_password = config.linkedin_password
     
     # Validate configuration
     if not api_token or not account_id:
         logger.error("❌ Missing required configuration: BROWSER_RENDERING_TOKEN and CLOUDFLARE_ACCOUNT_ID")
         return
     
-    logger.info(f"📋 Account ID: {account_id}")
-    logger.info(f"🔑 API Token: {api_token[:8]}...")
+    if args.linkedin_job_ids and not (linkedin_username and linkedin_password):
+        logger.error("❌ LinkedIn credentials not available. Please set LINKEDIN_USERNAME and LINKEDIN_PASSWORD in .dev.vars")
+        return
+    
+    # Skip slicing the token at all when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("📋 Account ID: %s", account_id)
+        logger.info("🔑 API Token: %s...", api_token[:8])
     
-    # Initialize client and asset manager
+    # Initialize client
     client = CloudflareBrowserRenderingClient(api_token, account_id)
-    asset_manager = AssetManager("scripts/assets/browser-render")
     
     all_saved_files = []
     
-    try:
-        # Run basic tests if requested or no specific test specified
-        if args.basic or (not args.linkedin_job_id and not args.comprehensive):
-            logger.info("🚀 Starting basic tests...")
-            
-            # Test basic functionality
-            screenshot_file = await test_basic_screenshot(client, asset_manager)
-            if screenshot_file:
-                all_saved_files.append(screenshot_file)
-            
-            content_file = await test_content_extraction(client, asset_manager)
-            if content_file:
-                all_saved_files.append(content_file)
-            
-            markdown_file = await test_markdown_extraction(client, asset_manager)
-            if markdown_file:
-                all_saved_files.append(markdown_file)
-            
-            json_file = await test_json_extraction(client, asset_manager)
-            if json_file:
-                all_saved_files.append(json_file)
-            
-            pdf_file = await test_pdf_generation(client, asset_manager)
-            if pdf_file:
-                all_saved_files.append(pdf_file)
-        
-        # Run comprehensive test if requested
-        if args.comprehensive:
-            logger.info("🚀 Starting comprehensive test...")
-            comp_files = await run_comprehensive_test(client, asset_manager)
-            all_saved_files.extend(comp_files)
-        
-        # Run LinkedIn job scraping if job ID provided
-        if args.linkedin_job_id:
-            if not linkedin_username or not linkedin_password:
-                logger.error("❌ LinkedIn credentials not available. Please set LINKEDIN_USERNAME and LINKEDIN_PASSWORD in .dev.vars")
-                return
-            
-            logger.info("🚀 Starting LinkedIn job scraping test...")
-            linkedin_files = await test_linkedin_job_scraping(
-                client, asset_manager, args.linkedin_job_id, linkedin_username, linkedin_password
-            )
-            all_saved_files.extend(linkedin_files)
-        
-        # Final summary
-        if all_saved_files:
-            logger.info(f"\n🎉 All tests completed! Total files saved: {len(all_saved_files)}")
-            logger.info("📁 All saved files:")
-            for file_path in all_saved_files:
-                logger.info(f"   {file_path}")
+    # The client holds one keep-alive session for the whole run; asset writes drain
+    # in the background and are all flushed before main returns
+    async with BackgroundSaveContext() as saver, client:
+        session = client.session
+        asset_manager = AssetManager("scripts/assets/browser-render", saver=saver)
+        
+        try:
+            # The requested test groups run concurrently; the client's request semaphore
+            # (BROWSER_RENDER_CONCURRENCY) bounds their combined fan-out
+            test_groups = []
+            
+            # Run basic tests if requested or no specific test specified
+            if args.basic or (not args.linkedin_job_ids and not args.comprehensive):
+                logger.info("🚀 Starting basic tests...")
+                test_groups.append(run_basic_tests(client, asset_manager, session))
+            
+            # Run comprehensive test if requested
+            if args.comprehensive:
+                logger.info("🚀 Starting comprehensive test...")
+                test_groups.append(run_comprehensive_test(client, asset_manager, session))
+            
+            # Run LinkedIn job scraping if job IDs provided
+            if args.linkedin_job_ids:
+                logger.info("🚀 Starting LinkedIn job scraping test...")
+                test_groups.append(run_linkedin_jobs(
+                    client, asset_manager, session, args.linkedin_job_ids, linkedin_username, linkedin_password
+                ))
+            
+            for group_files in await asyncio.gather(*test_groups):
+                all_saved_files.extend(group_files)
+            
+            # Final summary
+            if all_saved_files:
+                logger.info("\n🎉 All tests completed! Total files saved: %s", len(all_saved_files))
+                # One log record for the whole list rather than one per file
+                logger.info("📁 All saved files:\n%s", "\n".join(f"   {file_path}" for file_path in all_saved_files))
+            else:
+                logger.warning("⚠️ No files were saved. Check the logs for errors.")
             
             # Log file reference for AI agents
-            log_file = Path(__file__).parent / "browser_rendering_test.log"
-            logger.info(f"\n📋 Detailed logs available at: {log_file}")
-            logger.info(f"🤖 AI Agent: Review the log file for comprehensive test details")
-        else:
-            logger.warning("⚠️ No files were saved. Check the logs for errors.")
-            log_file = Path(__file__).parent / "browser_rendering_test.log"
-            logger.info(f"📋 Check detailed logs at: {log_file}")
-    
-    except Exception as e:
-        logger.error(f"❌ Test execution failed: {e}")
+            logger.info("\n📋 Detailed logs available at: %s", _LOG_FILE)
+            logger.info("🤖 AI Agent: Review the log file for comprehensive test details")
+        
+        except Exception as e:
+            logger.error("❌ Test execution failed: %s", e)
+
+def install_uvloop():
+    """Run the event loop on uvloop when it is installed; otherwise keep the stock asyncio loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def run_main(coro: Awaitable[Any]) -> None:
+    """Run coro on a fresh loop, then finish async generators and executor jobs before closing it"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    install_uvloop()
+    run_main(main())
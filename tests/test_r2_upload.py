@@ -11,19 +11,19 @@ from pathlib import Path
 
 def load_dev_vars():
     """Load environment variables from .dev.vars file"""
-    # Look for .dev.vars in the project root (two levels up from scripts/tests/)
-    dev_vars_path = Path(__file__).parent.parent.parent / ".dev.vars"
+    # Look for .dev.vars in the project root (the parent of tests/)
+    dev_vars_path = Path(__file__).resolve().parents[1] / ".dev.vars"
     env_vars = {}
     
     if dev_vars_path.exists():
-        with open(dev_vars_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    # Remove quotes if present
-                    value = value.strip('"\'')
-                    env_vars[key.strip()] = value
+        text = dev_vars_path.read_text(encoding='utf-8')
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line[0] == '#' or '=' not in line:
+                continue
+            key, _, value = line.partition('=')
+            # Remove quotes if present
+            env_vars[key.strip()] = value.strip('"\'')
         print("✅ Configuration loaded from .dev.vars")
     else:
         print("⚠️ .dev.vars file not found, using environment variables")